@@ -1,10 +1,12 @@
 import os
 import time
+import asyncio
 import json
 import requests
 from typing import List, Dict, Optional, Union, Any, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
+from .exceptions import APIError, APIConnectionError, InvalidRequestError, AuthenticationError, RateLimitError
 
 @dataclass
 class Message:
@@ -45,26 +47,6 @@ class ChatCompletion:
     choices: List[Choice]
     usage: Optional[Usage] = None
 
-class APIError(Exception):
-    """API错误基类"""
-    def __init__(self, message=None, http_status=None, response=None):
-        self.message = message
-        self.http_status = http_status
-        self.response = response
-        super().__init__(self.message)
-
-class RateLimitError(APIError):
-    """速率限制错误"""
-    pass
-
-class AuthenticationError(APIError):
-    """认证错误"""
-    pass
-
-class BadRequestError(APIError):
-    """请求错误"""
-    pass
-
 class Completions:
     """补全API类"""
     def __init__(self, client):
@@ -74,7 +56,7 @@ class Completions:
         self,
         messages: List[Dict[str, str]],
         model: str = "OpenAI-chat",
-        temperature: float = 0.7,
+        temperature: Optional[float] = 0.7,
         max_tokens: Optional[int] = None,
         stream: bool = False,
         **kwargs
@@ -85,7 +67,7 @@ class Completions:
         Args:
             messages: 消息列表
             model: 模型名称
-            temperature: 温度参数(0-1)
+            temperature: 温度参数(0-1)，为 None 时不发送，由服务端决定
             max_tokens: 最大生成token数
             stream: 是否启用流式输出
             **kwargs: 其他参数
@@ -103,11 +85,12 @@ class Completions:
         data = {
             "model": model,
             "messages": messages,
-            "temperature": temperature,
             "stream": stream,
             **kwargs
         }
         
+        if temperature is not None:
+            data["temperature"] = temperature
         if max_tokens is not None:
             data["max_tokens"] = max_tokens
             
@@ -225,7 +208,7 @@ class Completions:
         elif response.status_code == 429:
             raise RateLimitError(error_message, response.status_code, response)
         elif response.status_code == 400:
-            raise BadRequestError(error_message, response.status_code, response)
+            raise InvalidRequestError(error_message, response.status_code, response)
         else:
             raise APIError(error_message, response.status_code, response)
     
@@ -233,7 +216,7 @@ class Completions:
         """处理请求错误"""
         if hasattr(exception, 'response') and exception.response is not None:
             self._check_response_error(exception.response)
-        raise APIError(str(exception))
+        raise APIConnectionError(str(exception))
 
 class Chat:
     """聊天API类"""
@@ -259,10 +242,12 @@ class OpenAI:
                         messages: List[Message], 
                         functions: List[Dict[str, Any]] = None, 
                         model: str = "OpenAI-chat", 
-                        temperature: float = 0.5, 
+                        temperature: Optional[float] = 0.5, 
                         max_tokens: int = None, **kwargs) -> Union[ChatCompletion, Iterator[ChatCompletion]]:
         
-        return self.chat.completions.create(
+        # requests 是同步阻塞的，放到线程中执行，使并发调用（asyncio.gather）真正并行
+        return await asyncio.to_thread(
+            self.chat.completions.create,
             messages=messages,
             functions=functions,
             model=model,
@@ -1,22 +1,30 @@
 import os
 import sys
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from LLM import OpenAIClient, OpenAIError, APIError, AuthenticationError
 
+# 忽略 temperature 参数的推理模型，调用时不发送 temperature
+REASONING_MODELS = {"deepseek-reasoner"}
+
 class BaseAgent:
     def __init__(self, llm_client: OpenAIClient):
         self.llm = llm_client
 
-    async def _call_llm(self, messages: List[Dict[str, str]], temperature: float = 0.3, model: str = "deepseek-chat") -> str:
+    async def _call_llm(self, messages: List[Dict[str, str]], temperature: float = 0.3, model: str = "deepseek-chat", max_tokens: Optional[int] = None) -> str:
+        if model in REASONING_MODELS:
+            temperature = None
         try:
-            response = await self.llm(messages, model=model, temperature=temperature)
-            return response.choices[0].message.content
+            response = await self.llm(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+            choice = response.choices[0]
+            if choice.finish_reason == "length":
+                print(f"Warning: LLM output truncated by max_tokens={max_tokens}")
+            return choice.message.content
         except (OpenAIError, APIError, AuthenticationError) as e:
             print(f"Error calling LLM: {str(e)}")
             return ""
 
 class OutlineAgent(BaseAgent):
-    async def generate_outline(self, reference_text: str, temperature: float = 0.5, model: str = "deepseek-chat", style: str = "") -> tuple[List[str], List[str]]:
+    async def generate_outline(self, reference_text: str, temperature: float = 0.5, model: str = "deepseek-chat", style: str = "", max_tokens: Optional[int] = None) -> tuple[List[str], List[str]]:
         messages = [
             {
                 "role": "system",
@@ -45,7 +53,7 @@ class OutlineAgent(BaseAgent):
             }
         ]
         
-        response = await self._call_llm(messages, temperature = temperature, model = model)
+        response = await self._call_llm(messages, temperature = temperature, model = model, max_tokens = max_tokens)
         
         # 解析响应，提取大纲和写作提示
         sections = []
@@ -64,7 +72,18 @@ class OutlineAgent(BaseAgent):
         return sections, prompts
 
 class ContentAgent(BaseAgent):
-    async def generate_content(self, outline: str, reference_text: str, writing_prompt: str, temperature: float = 0.3, model: str = "deepseek-chat") -> str:
+    async def generate_content(self, outline: str, reference_text: str, writing_prompt: str, temperature: float = 0.3, model: str = "deepseek-chat", max_tokens: Optional[int] = None) -> str:
+        # 未提供参考文本时，只依据大纲和写作提示写作，不在提示词中要求引用参考文本
+        if reference_text:
+            reference_block = f"""
+参考文本：
+{reference_text}
+"""
+            requirement = "请生成这个部分的详细内容，确保内容与大纲主题相关，并充分利用参考文本的信息。"
+        else:
+            reference_block = ""
+            requirement = "请生成这个部分的详细内容，确保内容与大纲主题相关。不要编造具体的数据、引用或事实。"
+
         messages = [
             {
                 "role": "system",
@@ -75,22 +94,32 @@ class ContentAgent(BaseAgent):
                 "content": f"""请基于以下信息生成内容：
 
 大纲部分：{outline}
-
-参考文本：
-{reference_text}
-
+{reference_block}
 写作提示：
 {writing_prompt}
 
-请生成这个部分的详细内容，确保内容与大纲主题相关，并充分利用参考文本的信息。
+{requirement}
 """
             }
         ]
         
-        return await self._call_llm(messages, temperature = temperature, model = model)
+        return await self._call_llm(messages, temperature = temperature, model = model, max_tokens = max_tokens)
 
 class PolishAgent(BaseAgent):
-    async def polish_content(self, content: str, section_content: str, article: str,  temperature: float = 0.3, model: str = "deepseek-chat") -> str:
+    async def polish_content(self, content: str, section_content: str, article: str,  temperature: float = 0.3, model: str = "deepseek-chat", max_tokens: Optional[int] = None) -> str:
+        # 未提供参考文本时，跳过基于参考文本的事实修正，只做润色
+        if article:
+            instruction = "参考【参考文本】先对【当前章节】进行修改，删除逻辑性和事实不符类错误；然后请结合【全文章节】对【当前章节】进行润色，提升其表达质量："
+            reference_block = f"""
+【参考文本】
+{article}
+"""
+            fact_check = "\n6. 检查生成文本的相对【参考文本】的准确度，并基于【参考文本】来进行修正"
+        else:
+            instruction = "请先对【当前章节】进行修改，删除逻辑性错误；然后请结合【全文章节】对【当前章节】进行润色，提升其表达质量："
+            reference_block = ""
+            fact_check = ""
+
         messages = [
             {
                 "role": "system",
@@ -98,11 +127,8 @@ class PolishAgent(BaseAgent):
             },
             {
                 "role": "user",
-                "content": f"""参考【参考文本】先对【当前章节】进行修改，删除逻辑性和事实不符类错误；然后请结合【全文章节】对【当前章节】进行润色，提升其表达质量：
-
-【参考文本】
-{article}
-                
+                "content": f"""{instruction}
+{reference_block}
 【全文章节】
 {content}
 
@@ -114,10 +140,9 @@ class PolishAgent(BaseAgent):
 2. 提升语言的流畅性和专业性
 3. 优化段落结构和过渡，并去除冗余的地方
 4. 确保内容的连贯性和逻辑性
-5. 给上插图建议，在每个段落后面给上建议插图，用（）括起来
-6. 检查生成文本的相对【参考文本】的准确度，并基于【参考文本】来进行修正
+5. 给上插图建议，在每个段落后面给上建议插图，用（）括起来{fact_check}
 """
             }
         ]
         
-        return await self._call_llm(messages, temperature = temperature, model = model)
\ No newline at end of file
+        return await self._call_llm(messages, temperature = temperature, model = model, max_tokens = max_tokens)
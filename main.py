@@ -1,20 +1,29 @@
 import os
 import click
 import asyncio
-from typing import List
+from typing import List, Optional
 from LLM import OpenAIClient
 from agents import OutlineAgent, ContentAgent, PolishAgent
+from profiles import PROFILES, DEFAULT_MIN_QUALITY, GenerationProfile, estimate_run, estimate_tokens, plan_generation
 
-async def generate_blog_post(reference_text: str, model: str = "deepseek-chat", style: str = "微信公众号百万大V") -> str:
+async def generate_blog_post(reference_text: str, model: Optional[str] = None, style: str = "微信公众号百万大V", profile: Optional[GenerationProfile] = None) -> str:
     """
     使用多Agent系统生成一篇完整的博客文章。
     
     Args:
         reference_text: 参考文本内容
+        model: 模型名称，指定时覆盖生成配置中所有阶段的模型
+        style: 文章风格
+        profile: 生成配置，默认使用 balanced
         
     Returns:
         生成并润色后的完整博客文章
     """
+    if profile is None:
+        profile = PROFILES["balanced"]
+    if model:
+        profile = profile.with_model(model)
+
     # 初始化 LLM 客户端
     llm = OpenAIClient(base_url=os.environ.get("BASE_URL"), api_key=os.environ.get("OpenAI_API_KEY"))
     
@@ -22,35 +31,62 @@ async def generate_blog_post(reference_text: str, model: str = "deepseek-chat",
     outline_agent = OutlineAgent(llm)
     content_agent = ContentAgent(llm)
     polish_agent = PolishAgent(llm)
+
+    # 未开启检索时，内容和润色阶段不再附带参考文本，仅依赖大纲和写作提示
+    context_text = reference_text if profile.enable_retrieval else ""
     
-    print("1. 正在生成文章大纲...")
-    sections, prompts = await outline_agent.generate_outline(reference_text, model = model)
+    print(f"1. 正在生成文章大纲... (配置: {profile.name})")
+    sections, prompts = await outline_agent.generate_outline(
+        reference_text,
+        temperature=profile.outline.temperature,
+        model=profile.outline.model,
+        style=style,
+        max_tokens=profile.outline.max_tokens,
+    )
     
     print("\n生成的大纲：")
     for i, section in enumerate(sections, 1):
         print(f"{i}. {section}")
+
+    estimate = estimate_run(profile, estimate_tokens(reference_text), len(sections))
+    print(f"\n预计耗时 {estimate.latency:.0f}s，预计费用 ${estimate.cost:.4f}")
     
     print("\n2. 正在生成各部分内容...")
-    # 以并发的方式来调用generate_content方法，以便同时生成所有部分的内容，并将其保存到section_contents列表中
-    # section_contents = await asyncio.gather(*[content_agent.generate_content(section, reference_text, prompt) for section, prompt in zip(sections, prompts)])
-    
-    section_contents = []
-    for i, (section, prompt) in enumerate(zip(sections, prompts), 1):
-        print(f"\n生成第 {i} 部分: {section}")
-        content = await content_agent.generate_content(section, reference_text, prompt, model=model)
-        section_contents.append(f"## {section}\n\n{content}")
-    
-    # # 组合所有内容
-    # full_content = "\n\n".join(section_contents)
-    
-    print("\n3. 正在润色文章...")
-    for section_content_idx in range(len(section_contents)):
-        full_content = "\n\n".join(section_contents[:section_content_idx])
-        section_content = section_contents[section_content_idx]
-        polished_section_content = await polish_agent.polish_content(full_content, section_content, reference_text, model=model)
-        section_contents[section_content_idx] = polished_section_content
-        print(f"润色第 {section_content_idx + 1} 部分完成.")
-    # polished_content = await polish_agent.polish_content(full_content)
+    # 以并发的方式调用generate_content方法，并发数由生成配置限制
+    semaphore = asyncio.Semaphore(max(profile.concurrency, 1))
+
+    async def generate_section(i: int, section: str, prompt: str) -> str:
+        async with semaphore:
+            print(f"\n生成第 {i} 部分: {section}")
+            content = await content_agent.generate_content(
+                section,
+                context_text,
+                prompt,
+                temperature=profile.content.temperature,
+                model=profile.content.model,
+                max_tokens=profile.content.max_tokens,
+            )
+        return f"## {section}\n\n{content}"
+
+    section_contents = list(await asyncio.gather(*[
+        generate_section(i, section, prompt) for i, (section, prompt) in enumerate(zip(sections, prompts), 1)
+    ]))
+
+    if profile.enable_polish:
+        print("\n3. 正在润色文章...")
+        for section_content_idx in range(len(section_contents)):
+            full_content = "\n\n".join(section_contents[:section_content_idx])
+            section_content = section_contents[section_content_idx]
+            polished_section_content = await polish_agent.polish_content(
+                full_content,
+                section_content,
+                context_text,
+                temperature=profile.polish.temperature,
+                model=profile.polish.model,
+                max_tokens=profile.polish.max_tokens,
+            )
+            section_contents[section_content_idx] = polished_section_content
+            print(f"润色第 {section_content_idx + 1} 部分完成.")
 
     polished_content = "\n\n".join(section_contents)
     
@@ -68,8 +104,26 @@ async def generate_blog_post(reference_text: str, model: str = "deepseek-chat",
 )
 @click.option(
     "--model",
-    default="deepseek-chat",
-    help="模型名称",
+    default=None,
+    help="模型名称，指定时覆盖生成配置中所有阶段的模型",
+)
+@click.option(
+    "--profile",
+    type=click.Choice(["auto", *PROFILES]),
+    default="balanced",
+    help="生成配置，auto 表示按截止时间自动选择（需指定 --deadline）",
+)
+@click.option(
+    "--deadline",
+    type=float,
+    default=None,
+    help="截止时间（秒），--profile auto 时必填",
+)
+@click.option(
+    "--min_quality",
+    type=click.Choice(list(PROFILES)),
+    default=None,
+    help="auto 模式下可接受的最低质量（以配置名表示，默认 balanced）",
 )
 @click.option(
     "--base_url",
@@ -82,7 +136,14 @@ async def generate_blog_post(reference_text: str, model: str = "deepseek-chat",
     help="风格名称",
 )
 
-def main(api_key: str, file: str, style: str, output: str, model: str, base_url: str):
+def main(api_key: str, file: str, style: str, output: str, model: Optional[str], profile: str, deadline: Optional[float], min_quality: Optional[str], base_url: str):
+    if deadline is not None and profile != "auto":
+        raise click.UsageError("--deadline 只能与 --profile auto 一起使用")
+    if min_quality is not None and profile != "auto":
+        raise click.UsageError("--min_quality 只能与 --profile auto 一起使用")
+    if profile == "auto" and deadline is None:
+        raise click.UsageError("--profile auto 需要同时指定 --deadline")
+
     # 设置API密钥
 
     os.environ["OpenAI_API_KEY"] = api_key  # 请替换为您的API密钥
@@ -98,7 +159,19 @@ def main(api_key: str, file: str, style: str, output: str, model: str, base_url:
     with open(file,'r', encoding='utf-8') as f:
         reference_text = f.read()
 
-    final_article = asyncio.run(generate_blog_post(reference_text, model=model, style=style))
+    if profile == "auto":
+        # 先应用 --model 覆盖，使预测的耗时和费用对应实际会调用的模型
+        candidates = [p.with_model(model) if model else p for p in PROFILES.values()]
+        quality_floor = PROFILES[min_quality].quality if min_quality else DEFAULT_MIN_QUALITY
+        plan = plan_generation(reference_text, deadline=deadline, profiles=candidates, min_quality=quality_floor)
+        if plan.profile.quality < quality_floor or plan.latency > deadline:
+            print(f"没有满足最低质量的配置能在 {deadline:.0f}s 内完成，改用最快的配置")
+        print(f"选用配置 {plan.profile.name}：预计耗时 {plan.latency:.0f}s，预计费用 ${plan.cost:.4f}")
+        generation_profile = plan.profile
+    else:
+        generation_profile = PROFILES[profile]
+
+    final_article = asyncio.run(generate_blog_post(reference_text, model=model, style=style, profile=generation_profile))
     # 保存final_article到result.txt文件中
     with open(output, 'w',encoding="utf-8") as f:
         f.write(str(final_article))
@@ -0,0 +1,264 @@
+import math
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class StageConfig:
+    """单个生成阶段的调用参数"""
+    model: str = "deepseek-chat"
+    temperature: float = 0.3
+    max_tokens: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    """生成配置：为大纲、内容、润色三个阶段分别指定模型与参数"""
+    name: str
+    # 生成质量等级，数值越大质量越高，规划器只在不低于 min_quality 的配置中选择
+    quality: int = 0
+    outline: StageConfig = field(default_factory=lambda: StageConfig(temperature=0.5))
+    content: StageConfig = field(default_factory=StageConfig)
+    polish: StageConfig = field(default_factory=StageConfig)
+    # 内容阶段的最大并发请求数
+    concurrency: int = 1
+    enable_polish: bool = True
+    # 是否在内容和润色阶段附带完整的参考文本
+    enable_retrieval: bool = True
+
+    def with_model(self, model: str) -> "GenerationProfile":
+        """返回所有阶段都使用同一模型的副本"""
+        return replace(
+            self,
+            outline=replace(self.outline, model=model),
+            content=replace(self.content, model=model),
+            polish=replace(self.polish, model=model),
+        )
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """模型的价格与速度估计，价格单位为 美元/百万token"""
+    input_price: float
+    output_price: float
+    # 输出速度 (token/s)
+    output_speed: float
+    # 输入处理速度 (token/s)
+    prefill_speed: float = 5000.0
+    # 首token延迟 (s)
+    first_token_latency: float = 1.0
+    # 推理模型每次调用额外产生的思维链token（按输出计费）
+    reasoning_tokens: int = 0
+
+
+MODEL_SPECS: Dict[str, ModelSpec] = {
+    "deepseek-chat": ModelSpec(input_price=0.27, output_price=1.10, output_speed=40.0, first_token_latency=1.0),
+    "deepseek-reasoner": ModelSpec(input_price=0.55, output_price=2.19, output_speed=30.0, first_token_latency=8.0, reasoning_tokens=1000),
+}
+
+# 未登记模型使用的保守估计
+DEFAULT_MODEL_SPEC = ModelSpec(input_price=1.0, output_price=3.0, output_speed=30.0, first_token_latency=2.0)
+
+PROFILES: Dict[str, GenerationProfile] = {
+    "fast": GenerationProfile(
+        name="fast",
+        quality=1,
+        outline=StageConfig(temperature=0.5, max_tokens=1024),
+        content=StageConfig(temperature=0.3, max_tokens=800),
+        polish=StageConfig(temperature=0.3, max_tokens=800),
+        concurrency=8,
+        enable_polish=False,
+        enable_retrieval=False,
+    ),
+    "balanced": GenerationProfile(
+        name="balanced",
+        quality=2,
+        outline=StageConfig(temperature=0.5),
+        content=StageConfig(temperature=0.3),
+        polish=StageConfig(temperature=0.3),
+        concurrency=4,
+    ),
+    "premium": GenerationProfile(
+        name="premium",
+        quality=3,
+        # 推理模型的思维链计入输出token，不设上限以免截断
+        outline=StageConfig(model="deepseek-reasoner", temperature=0.5),
+        content=StageConfig(temperature=0.3),
+        polish=StageConfig(model="deepseek-reasoner", temperature=0.3),
+        concurrency=4,
+    ),
+}
+
+# 提示词模板本身的token开销
+PROMPT_OVERHEAD_TOKENS = 300
+# 大纲阶段每个章节的输出token（标题 + 写作提示）
+OUTLINE_TOKENS_PER_SECTION = 80
+# 未指定 max_tokens 时每个章节的输出token
+DEFAULT_SECTION_TOKENS = 1200
+# 尚未生成大纲时假设的章节数
+DEFAULT_NUM_SECTIONS = 6
+# 规划器默认的最低质量等级
+DEFAULT_MIN_QUALITY = PROFILES["balanced"].quality
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估计文本的token数：中文约每字0.6个token，其他字符约每4个一个token"""
+    cjk = sum(1 for ch in text if "一" <= ch <= "鿿")
+    return math.ceil(cjk * 0.6 + (len(text) - cjk) / 4)
+
+
+@dataclass
+class StageEstimate:
+    """单个阶段的预测结果"""
+    stage: str
+    calls: int
+    input_tokens: int
+    output_tokens: int
+    latency: float
+    cost: float
+
+
+@dataclass
+class RunEstimate:
+    """一次完整生成的预测结果"""
+    profile: GenerationProfile
+    stages: List[StageEstimate]
+
+    @property
+    def latency(self) -> float:
+        return sum(stage.latency for stage in self.stages)
+
+    @property
+    def cost(self) -> float:
+        return sum(stage.cost for stage in self.stages)
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(stage.input_tokens + stage.output_tokens for stage in self.stages)
+
+
+def _call_latency(spec: ModelSpec, input_tokens: int, output_tokens: int) -> float:
+    output_tokens += spec.reasoning_tokens
+    return spec.first_token_latency + input_tokens / spec.prefill_speed + output_tokens / spec.output_speed
+
+
+def _call_cost(spec: ModelSpec, input_tokens: int, output_tokens: int) -> float:
+    output_tokens += spec.reasoning_tokens
+    return (input_tokens * spec.input_price + output_tokens * spec.output_price) / 1_000_000
+
+
+def _section_tokens(stage: StageConfig) -> int:
+    if stage.max_tokens is None:
+        return DEFAULT_SECTION_TOKENS
+    return min(stage.max_tokens, DEFAULT_SECTION_TOKENS)
+
+
+def estimate_run(profile: GenerationProfile, reference_tokens: int, num_sections: int = DEFAULT_NUM_SECTIONS) -> RunEstimate:
+    """
+    根据参考文本大小和大纲长度预测一次生成的耗时与费用。
+
+    Args:
+        profile: 生成配置
+        reference_tokens: 参考文本的token数
+        num_sections: 大纲章节数
+
+    Returns:
+        各阶段的预测结果
+    """
+    stages = []
+    context_tokens = reference_tokens if profile.enable_retrieval else 0
+
+    # 大纲阶段：单次调用，始终读取完整参考文本
+    spec = MODEL_SPECS.get(profile.outline.model, DEFAULT_MODEL_SPEC)
+    input_tokens = PROMPT_OVERHEAD_TOKENS + reference_tokens
+    output_tokens = OUTLINE_TOKENS_PER_SECTION * num_sections
+    if profile.outline.max_tokens is not None:
+        output_tokens = min(output_tokens, profile.outline.max_tokens)
+    stages.append(StageEstimate(
+        stage="outline",
+        calls=1,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        latency=_call_latency(spec, input_tokens, output_tokens),
+        cost=_call_cost(spec, input_tokens, output_tokens),
+    ))
+
+    # 内容阶段：各章节按 concurrency 分批并发
+    spec = MODEL_SPECS.get(profile.content.model, DEFAULT_MODEL_SPEC)
+    section_tokens = _section_tokens(profile.content)
+    per_call_input = PROMPT_OVERHEAD_TOKENS + context_tokens + OUTLINE_TOKENS_PER_SECTION
+    waves = math.ceil(num_sections / max(profile.concurrency, 1))
+    stages.append(StageEstimate(
+        stage="content",
+        calls=num_sections,
+        input_tokens=per_call_input * num_sections,
+        output_tokens=section_tokens * num_sections,
+        latency=waves * _call_latency(spec, per_call_input, section_tokens),
+        cost=num_sections * _call_cost(spec, per_call_input, section_tokens),
+    ))
+
+    # 润色阶段：依赖前文，逐章节顺序执行，上下文随章节增长
+    if profile.enable_polish:
+        spec = MODEL_SPECS.get(profile.polish.model, DEFAULT_MODEL_SPEC)
+        polished_tokens = min(_section_tokens(profile.polish), section_tokens)
+        input_total = output_total = 0
+        latency = cost = 0.0
+        for idx in range(num_sections):
+            input_tokens = PROMPT_OVERHEAD_TOKENS + context_tokens + idx * polished_tokens + section_tokens
+            input_total += input_tokens
+            output_total += polished_tokens
+            latency += _call_latency(spec, input_tokens, polished_tokens)
+            cost += _call_cost(spec, input_tokens, polished_tokens)
+        stages.append(StageEstimate(
+            stage="polish",
+            calls=num_sections,
+            input_tokens=input_total,
+            output_tokens=output_total,
+            latency=latency,
+            cost=cost,
+        ))
+
+    return RunEstimate(profile=profile, stages=stages)
+
+
+def plan_generation(
+    reference_text: str,
+    deadline: Optional[float] = None,
+    num_sections: int = DEFAULT_NUM_SECTIONS,
+    profiles: Optional[List[GenerationProfile]] = None,
+    min_quality: int = DEFAULT_MIN_QUALITY,
+) -> RunEstimate:
+    """
+    在质量不低于 min_quality 且能在截止时间内完成的配置中，选出费用最低的生成配置。
+
+    Args:
+        reference_text: 参考文本内容
+        deadline: 截止时间（秒），为 None 时不限时
+        num_sections: 预计的大纲章节数
+        profiles: 候选配置，默认使用 PROFILES 中的全部配置
+        min_quality: 最低质量等级
+
+    Returns:
+        选中配置的预测结果；若没有配置同时满足质量和截止时间，返回预测耗时最短的配置
+    """
+    if profiles is None:
+        profiles = list(PROFILES.values())
+    if not profiles:
+        raise ValueError("At least one generation profile must be provided")
+
+    # 覆盖模型后可能出现参数完全相同的配置，只保留其中质量等级最低的一个，避免以更高等级的名义选中同一配置
+    unique: Dict[GenerationProfile, GenerationProfile] = {}
+    for profile in sorted(profiles, key=lambda profile: profile.quality):
+        unique.setdefault(replace(profile, name="", quality=0), profile)
+    profiles = list(unique.values())
+
+    reference_tokens = estimate_tokens(reference_text)
+    estimates = [estimate_run(profile, reference_tokens, num_sections) for profile in profiles]
+
+    feasible = [
+        estimate for estimate in estimates
+        if estimate.profile.quality >= min_quality and (deadline is None or estimate.latency <= deadline)
+    ]
+    if feasible:
+        return min(feasible, key=lambda estimate: estimate.cost)
+    return min(estimates, key=lambda estimate: estimate.latency)
@@ -0,0 +1,95 @@
+from dataclasses import replace
+
+import pytest
+
+from profiles import PROFILES, GenerationProfile, StageConfig, estimate_run, estimate_tokens, plan_generation
+
+REFERENCE_TEXT = "人工智能是模拟人类智能的计算机系统。" * 200
+
+
+def test_estimate_tokens_counts_cjk_and_ascii():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("一二三四五") == 3
+    assert estimate_tokens("abcdefgh") == 2
+
+
+def test_tight_and_loose_deadlines_pick_different_profiles():
+    tight = plan_generation(REFERENCE_TEXT, deadline=60)
+    loose = plan_generation(REFERENCE_TEXT, deadline=3600)
+    assert tight.profile.name == "fast"
+    assert loose.profile.name == "balanced"
+    assert tight.latency <= 60
+    assert loose.latency <= 3600
+
+
+def test_picks_cheapest_profile_meeting_quality_floor():
+    assert plan_generation(REFERENCE_TEXT).profile.name == "balanced"
+    assert plan_generation(REFERENCE_TEXT, min_quality=1).profile.name == "fast"
+    assert plan_generation(REFERENCE_TEXT, min_quality=3).profile.name == "premium"
+
+
+def test_quality_floor_falls_back_to_fastest_when_deadline_too_tight():
+    plan = plan_generation(REFERENCE_TEXT, deadline=300, min_quality=3)
+    assert plan.profile.name == "fast"
+
+
+def test_no_feasible_profile_falls_back_to_fastest():
+    plan = plan_generation(REFERENCE_TEXT, deadline=1)
+    fastest = min(
+        (estimate_run(profile, estimate_tokens(REFERENCE_TEXT)) for profile in PROFILES.values()),
+        key=lambda estimate: estimate.latency,
+    )
+    assert plan.latency > 1
+    assert plan.profile.name == fastest.profile.name
+
+
+def test_same_quality_prefers_cheaper_profile():
+    cheap = GenerationProfile(name="cheap", quality=1)
+    pricey = GenerationProfile(name="pricey", quality=1, content=StageConfig(model="deepseek-reasoner"))
+    plan = plan_generation(REFERENCE_TEXT, profiles=[pricey, cheap], min_quality=1)
+    assert plan.profile.name == "cheap"
+
+
+def test_plan_requires_profiles():
+    with pytest.raises(ValueError):
+        plan_generation(REFERENCE_TEXT, profiles=[])
+
+
+def test_disabling_polish_drops_polish_stage():
+    profile = PROFILES["balanced"]
+    with_polish = estimate_run(profile, 1000)
+    without_polish = estimate_run(replace(profile, enable_polish=False), 1000)
+    assert [stage.stage for stage in with_polish.stages] == ["outline", "content", "polish"]
+    assert [stage.stage for stage in without_polish.stages] == ["outline", "content"]
+    assert without_polish.latency < with_polish.latency
+    assert without_polish.cost < with_polish.cost
+
+
+def test_concurrency_reduces_latency_but_not_cost():
+    profile = replace(PROFILES["balanced"], enable_polish=False)
+    sequential = estimate_run(replace(profile, concurrency=1), 1000, num_sections=6)
+    concurrent = estimate_run(replace(profile, concurrency=3), 1000, num_sections=6)
+    assert concurrent.stages[1].latency == pytest.approx(sequential.stages[1].latency / 3)
+    assert concurrent.cost == pytest.approx(sequential.cost)
+
+
+def test_disabling_retrieval_reduces_input_tokens():
+    profile = PROFILES["balanced"]
+    with_reference = estimate_run(profile, 5000)
+    without_reference = estimate_run(replace(profile, enable_retrieval=False), 5000)
+    assert without_reference.stages[0].input_tokens == with_reference.stages[0].input_tokens
+    assert without_reference.stages[1].input_tokens < with_reference.stages[1].input_tokens
+
+
+def test_with_model_overrides_every_stage():
+    profile = PROFILES["premium"].with_model("deepseek-chat")
+    assert {profile.outline.model, profile.content.model, profile.polish.model} == {"deepseek-chat"}
+    assert profile.outline.temperature == 0.5
+    assert profile.content.temperature == 0.3
+    assert profile.polish.temperature == 0.3
+
+
+def test_model_override_does_not_pick_premium_copy():
+    candidates = [profile.with_model("deepseek-chat") for profile in PROFILES.values()]
+    plan = plan_generation(REFERENCE_TEXT, profiles=candidates)
+    assert plan.profile.name != "premium"